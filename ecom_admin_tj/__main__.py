@@ -0,0 +1,4 @@
+from .manage import run
+
+if __name__ == "__main__":
+    run()
@@ -1,7 +1,9 @@
 from .base import Base
 from .excel_format_mixin import ExcelFormatMixin
+from .xlsxwriter_format_mixin import XlsxWriterFormatMixin
 
 __all__ = [
     'Base',
     'ExcelFormatMixin',
+    'XlsxWriterFormatMixin',
 ]
\ No newline at end of file
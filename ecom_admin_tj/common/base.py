@@ -9,6 +9,8 @@ class Base(ABC, ExcelFormatMixin):
     SCRIPT_DIR: Path | None = None
     MAPPING_FILE: Path | None = None
     ORIGINAL_SHEET_NAME: str | None = None
+    # pandas read_excel engine, None keeps the pandas default (openpyxl)
+    EXCEL_ENGINE: str | None = None
     
     def __init__(self, input_file: str, output_file: str = None, shipping_date: datetime = None, mapping_file: str = None):
         """
@@ -55,11 +57,17 @@ class Base(ABC, ExcelFormatMixin):
         """Calculate finance dataframe from main_df dataframe"""
         pass
 
-    def load_canceled_orders(self) -> pd.DataFrame:
-        """Load canceled orders from input file if exists"""
+    def load_canceled_orders(self, input_xlsx: pd.ExcelFile | None = None) -> pd.DataFrame:
+        """Load canceled orders from input file if exists
+        Args:
+            input_xlsx: Optional already opened input workbook, avoids opening the file again
+        """
         if self.canceled_orders_df is None:
             try :
-                self.canceled_orders_df = pd.read_excel(self.input_file, sheet_name='canceled_orders', dtype={'canceled_orders_sn': str})
+                if input_xlsx is None:
+                    self.canceled_orders_df = pd.read_excel(self.input_file, sheet_name='canceled_orders', dtype={'canceled_orders_sn': str}, engine=self.EXCEL_ENGINE)
+                else:
+                    self.canceled_orders_df = pd.read_excel(input_xlsx, sheet_name='canceled_orders', dtype={'canceled_orders_sn': str})
             # ValueError occurs when sheet does not exist
             except (ValueError):
                 print('No canceled orders sheet found. Continuing without excluding any orders.')
@@ -78,7 +86,12 @@ class Base(ABC, ExcelFormatMixin):
             left_on=self.merge_left, 
             right_on=self.merge_right, 
             how='left')
-        
+        self._check_missing_mapping()
+
+        return self.merged_df
+
+    def _check_missing_mapping(self) -> None:
+        """Raise ValueError if some rows in merged_df got no mapping"""
         # check NaN after merge
         missing_mapping = self.merged_df[self.merged_df['multiplier'].isna()]
         if not missing_mapping.empty:
@@ -86,8 +99,6 @@ class Base(ABC, ExcelFormatMixin):
             for index, row in missing_mapping.iterrows():
                 print(row)
             raise ValueError("Mapping incomplete: some items in main_df have no corresponding entry in mapping_df.")
-
-        return self.merged_df
     
     @abstractmethod
     def calculate_invoice(self) -> pd.DataFrame:
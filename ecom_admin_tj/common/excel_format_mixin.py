@@ -2,6 +2,15 @@ from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.worksheet.worksheet import Worksheet
 
 class ExcelFormatMixin:
+    def _set_column_widths(self, sheet: Worksheet, widths: list[tuple[str, int]]) -> None:
+        """Apply column widths to given sheet
+        Args:
+            sheet: Worksheet to format
+            widths: List of (column letter, width) pairs
+        """
+        for col, width in widths:
+            sheet.column_dimensions[col].width = width
+
     def _formating_header(
         self, sheet: Worksheet, row_height: int | None = None, font_color: str='FFFFFF', font_size: int=16, 
         start_color: str='4472C4', end_color: str='4472C4', fill_type: str='solid',
@@ -20,10 +29,14 @@ class ExcelFormatMixin:
         """
         if row_height is not None:
             sheet.row_dimensions[1].height = row_height
+        # style objects are immutable, build once and share across cells
+        font = Font(bold=True, color=font_color, size=font_size)
+        fill = PatternFill(start_color=start_color, end_color=end_color, fill_type=fill_type)
+        alignment = Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text)
         for cell in sheet[1]:
-            cell.font = Font(bold=True, color=font_color, size=font_size)
-            cell.fill = PatternFill(start_color=start_color, end_color=end_color, fill_type=fill_type)
-            cell.alignment = Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text)
+            cell.font = font
+            cell.fill = fill
+            cell.alignment = alignment
             
     def _formatting_body(
         self, sheet: Worksheet, start_row: int, end_row: int, start_col: int, end_col: int,
@@ -39,10 +52,11 @@ class ExcelFormatMixin:
             font_color: Font color for body
             font_size: Font size for body
         """
+        font = Font(color=font_color, size=font_size)
         for row in sheet.iter_rows(min_row=start_row, max_row=end_row, min_col=start_col, max_col=end_col):
             sheet.row_dimensions[row[0].row].height = row_height
             for cell in row:
-                cell.font = Font(color=font_color, size=font_size)
+                cell.font = font
                 
     def _formatting_footer(
         self, sheet: Worksheet, footer_row: int, row_height: int | None = None, 
@@ -64,7 +78,10 @@ class ExcelFormatMixin:
         """
         if row_height is not None:
             sheet.row_dimensions[footer_row].height = row_height
+        font = Font(bold=True, color=font_color, size=font_size)
+        fill = PatternFill(start_color=start_color, end_color=end_color, fill_type=fill_type)
+        alignment = Alignment(vertical=vertical, wrap_text=wrap_text)
         for cell in sheet[footer_row]:
-            cell.font = Font(bold=True, color=font_color, size=font_size)
-            cell.fill = PatternFill(start_color=start_color, end_color=end_color, fill_type=fill_type)
-            cell.alignment = Alignment(vertical=vertical, wrap_text=wrap_text)
+            cell.font = font
+            cell.fill = fill
+            cell.alignment = alignment
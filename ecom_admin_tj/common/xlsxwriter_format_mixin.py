@@ -0,0 +1,145 @@
+from weakref import WeakKeyDictionary
+import pandas as pd
+from xlsxwriter.format import Format
+from xlsxwriter.workbook import Workbook
+from xlsxwriter.worksheet import Worksheet
+
+class XlsxWriterFormatMixin:
+    """Formatting helpers for sheets written with the xlsxwriter engine
+
+    Styles are applied while rows are written instead of walking cells
+    afterwards: header and footer values are written with their format and body
+    rows get a row format. Call the helpers in row order (header, body, rows,
+    blank rows, footer) so they also work on a constant_memory workbook.
+    constant_memory drops row formats of rows that never get a cell, use
+    _xlsx_blank_rows for formatted rows left empty for the user to fill.
+    Row numbers are 1-based, same as ExcelFormatMixin.
+    """
+
+    # formats already added to each workbook, keyed by their properties
+    _xlsx_formats: 'WeakKeyDictionary[Workbook, dict[tuple, Format]]' = WeakKeyDictionary()
+
+    def _xlsx_format(self, workbook: Workbook, properties: dict) -> Format:
+        """Return the workbook format for given properties, adding it only once
+        Args:
+            workbook: Workbook that owns the format
+            properties: xlsxwriter format properties
+        """
+        formats = self._xlsx_formats.setdefault(workbook, {})
+        key = tuple(sorted(properties.items()))
+        if key not in formats:
+            formats[key] = workbook.add_format(properties)
+        return formats[key]
+
+    def _xlsx_rows(self, sheet: Worksheet, df: pd.DataFrame, start_row: int=2, chunk_size: int=1000) -> None:
+        """Stream dataframe rows to given sheet, missing values are left blank
+        Args:
+            sheet: Worksheet to write
+            df: Dataframe to write, without header
+            start_row: Row number of the first dataframe row
+            chunk_size: Number of rows converted at a time
+        """
+        # blank out missing values one chunk at a time, so only chunk_size rows
+        # are held as python objects while the sheet streams to disk
+        for chunk_start in range(0, len(df), chunk_size):
+            chunk = df.iloc[chunk_start:chunk_start + chunk_size]
+            rows = chunk.astype(object).where(chunk.notna(), None).to_numpy().tolist()
+            for row_num, row in enumerate(rows, start=start_row - 1 + chunk_start):
+                sheet.write_row(row_num, 0, row)
+
+    def _xlsx_column_widths(self, sheet: Worksheet, widths: list[tuple[str, int]]) -> None:
+        """Apply column widths to given sheet
+        Args:
+            sheet: Worksheet to format
+            widths: List of (column letter, width) pairs
+        """
+        for col, width in widths:
+            sheet.set_column(f'{col}:{col}', width)
+
+    def _xlsx_header(
+        self, workbook: Workbook, sheet: Worksheet, columns: list[str], row_height: int | None = None,
+        font_color: str='FFFFFF', font_size: int=16, bg_color: str='4472C4',
+        horizontal: str='center', vertical: str='top', wrap_text: bool=True) -> None:
+        """Apply header formatting to given sheet
+        Args:
+            workbook: Workbook that owns the sheet
+            sheet: Worksheet to format
+            columns: Header values to write with the header format
+            row_height: Height of the header row
+            font_color: Font color for header
+            font_size: Font size for header
+            bg_color: Fill color for header
+            horizontal: Horizontal alignment
+            vertical: Vertical alignment
+            wrap_text: Whether to wrap text
+        """
+        header_format = self._xlsx_format(workbook, {
+            'bold': True, 'font_color': f'#{font_color}', 'font_size': font_size,
+            'bg_color': f'#{bg_color}', 'pattern': 1,
+            'align': horizontal, 'valign': 'vcenter' if vertical == 'center' else vertical,
+            'text_wrap': wrap_text,
+        })
+        sheet.set_row(0, row_height)
+        sheet.write_row(0, 0, list(columns), header_format)
+
+    def _xlsx_body(
+        self, workbook: Workbook, sheet: Worksheet, start_row: int, end_row: int,
+        row_height: int=24, font_color: str='000000', font_size: int=14) -> None:
+        """Apply body formatting to given sheet
+        Args:
+            workbook: Workbook that owns the sheet
+            sheet: Worksheet to format
+            start_row: Starting row number for body formatting
+            end_row: Ending row number for body formatting
+            row_height: Height of each row
+            font_color: Font color for body
+            font_size: Font size for body
+        """
+        body_format = self._xlsx_format(workbook, {'font_color': f'#{font_color}', 'font_size': font_size})
+        for row in range(start_row - 1, end_row):
+            sheet.set_row(row, row_height, body_format)
+
+    def _xlsx_blank_rows(
+        self, workbook: Workbook, sheet: Worksheet, start_row: int, end_row: int, end_col: int=1,
+        row_height: int=24, font_color: str='000000', font_size: int=14) -> None:
+        """Write formatted blank cells to given sheet, keeps empty template rows styled
+        Args:
+            workbook: Workbook that owns the sheet
+            sheet: Worksheet to format
+            start_row: Starting row number of the blank rows
+            end_row: Ending row number of the blank rows
+            end_col: Number of columns to fill with blank cells
+            row_height: Height of each row
+            font_color: Font color for blank cells
+            font_size: Font size for blank cells
+        """
+        body_format = self._xlsx_format(workbook, {'font_color': f'#{font_color}', 'font_size': font_size})
+        for row in range(start_row - 1, end_row):
+            sheet.set_row(row, row_height, body_format)
+            for col in range(end_col):
+                sheet.write_blank(row, col, None, body_format)
+
+    def _xlsx_footer(
+        self, workbook: Workbook, sheet: Worksheet, footer_row: int, values: list, row_height: int | None = None,
+        font_color: str='FFFFFF', font_size: int=16, bg_color: str='4472C4',
+        vertical: str='top', wrap_text: bool=True) -> None:
+        """Apply footer formatting to given sheet
+        Args:
+            workbook: Workbook that owns the sheet
+            sheet: Worksheet to format
+            footer_row: Row number of the footer
+            values: Footer values to write with the footer format
+            row_height: Height of the footer row
+            font_color: Font color for footer
+            font_size: Font size for footer
+            bg_color: Fill color for footer
+            vertical: Vertical alignment
+            wrap_text: Whether to wrap text
+        """
+        footer_format = self._xlsx_format(workbook, {
+            'bold': True, 'font_color': f'#{font_color}', 'font_size': font_size,
+            'bg_color': f'#{bg_color}', 'pattern': 1,
+            'valign': 'vcenter' if vertical == 'center' else vertical, 'text_wrap': wrap_text,
+        })
+        sheet.set_row(footer_row - 1, row_height)
+        sheet.write_row(footer_row - 1, 0, list(values), footer_format)
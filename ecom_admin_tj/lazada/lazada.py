@@ -62,12 +62,8 @@ class Lazada(Base):
             self.input_file, 
             sheet_name=self.ORIGINAL_SHEET_NAME,
             dtype=dtype_dict)
-        self.main_df = pd.read_excel(
-            self.input_file, 
-            sheet_name=self.ORIGINAL_SHEET_NAME, 
-            dtype=dtype_dict, 
-            usecols=columns)
-        self.main_df.fillna({'sellerDiscountTotal': 0}, inplace=True)
+        # main columns come from the sheet already in memory, no second read
+        self.main_df = self.original_df[columns].fillna({'sellerDiscountTotal': 0})
         self.main_df['lazadaSku'] = self.main_df['lazadaSku'].map(lambda x: x.split('_')[0])
         
         # read canceled sheets    
@@ -89,14 +85,15 @@ class Lazada(Base):
             'unitPrice': 'sum',
             'sellerDiscountTotal': 'sum'
         }).reset_index()
-        self.invoice_df.loc['TOTAL'] = [
-            'TOTAL',
-            '', 
-            '', 
-            self.invoice_df['paidPrice'].sum(),
-            self.invoice_df['unitPrice'].sum(),
-            self.invoice_df['sellerDiscountTotal'].sum()
-            ]
+        total_row = pd.DataFrame([{
+            'stock_item_id': 'TOTAL',
+            'stock_item_name': '',
+            'multiplier': '',
+            'paidPrice': self.invoice_df['paidPrice'].sum(),
+            'unitPrice': self.invoice_df['unitPrice'].sum(),
+            'sellerDiscountTotal': self.invoice_df['sellerDiscountTotal'].sum(),
+        }])
+        self.invoice_df = pd.concat([self.invoice_df, total_row], ignore_index=True)
         self.invoice_df.columns = ['stock_item_id', 'stock_item_name', 'จำนวนรวม', 'ลูกค้าจ่าย', 'ราคาสุทธิ', 'ส่วนลดรวม']
         return self.invoice_df
 
@@ -111,13 +108,13 @@ class Lazada(Base):
         }).reset_index()
         
         # Add footer row with totals
-        total_row = {
+        total_row = pd.DataFrame([{
             'orderNumber': 'TOTAL',
             'paidPrice': self.finance_df['paidPrice'].sum(),
             'unitPrice': self.finance_df['unitPrice'].sum(),
             'sellerDiscountTotal': self.finance_df['sellerDiscountTotal'].sum(),
-        }
-        self.finance_df.loc[len(self.finance_df)] = total_row
+        }])
+        self.finance_df = pd.concat([self.finance_df, total_row], ignore_index=True)
         
         return self.finance_df
 
@@ -113,10 +113,10 @@ def create_item_mapping_excel():
         mapping_sheet.row_dimensions[1].height = 30
         
         # Create dropdown for platform_item_id column (Column A)
-        platform_item_ids = platform_df['item_id'].astype(str).tolist()
+        # List points at the Platform Items sheet, inline lists are limited to 255 characters
         dv_platform = DataValidation(
             type="list",
-            formula1=f'"' + ','.join(platform_item_ids[:100]) + '"',  # Limit to first 100 items
+            formula1=f"'Platform Items'!$A$2:$A${len(platform_df) + 1}",
             allow_blank=True
         )
         dv_platform.error = 'Please select a valid platform item ID'
@@ -130,10 +130,9 @@ def create_item_mapping_excel():
             mapping_sheet[f'B{row}'] = f'=IFERROR(VLOOKUP(A{row},\'Platform Items\'!A:B,2,FALSE),"")'
         
         # Create dropdown for stock_item_id column (Column C)
-        stock_item_ids = stock_df['item_id'].astype(str).tolist()
         dv_stock = DataValidation(
             type="list",
-            formula1=f'"' + ','.join(stock_item_ids) + '"',
+            formula1=f"'Stock Items'!$A$2:$A${len(stock_df) + 1}",
             allow_blank=True
         )
         dv_stock.error = 'Please select a valid stock item ID'
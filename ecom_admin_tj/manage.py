@@ -0,0 +1,80 @@
+import argparse
+import os
+import sys
+
+def cmd_shopee(args: list[str]) -> None:
+    from .shopee import Shopee
+    # ส่ง argument ที่เหลือหลังชื่อคำสั่งให้ Shopee.from_args โดยตรง
+    # ['ecom-admin', 'shopee', 'file.xlsx'] -> ['file.xlsx']
+    Shopee.from_args(args).process()
+
+def cmd_help(args: list[str] | None = None) -> None:
+    create_argument_parser().print_help()
+
+def _excepthook(exc_type, exc, tb):
+    """Report unhandled errors in one line, full traceback with ECOM_ADMIN_DEBUG=1"""
+    if os.environ.get("ECOM_ADMIN_DEBUG") == "1":
+        sys.__excepthook__(exc_type, exc, tb)
+    else:
+        sys.stderr.write(f"\n❌ Error: {exc_type.__name__}: {exc}\n")
+
+def _command_handler(command: str):
+    """Return the cmd_<command> function of this module, None if there is no such command"""
+    handler = globals().get(f"cmd_{command}")
+    return handler if callable(handler) else None
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Create argument parser with one subcommand per cmd_<name> handler
+    
+    Returns:
+        Configured ArgumentParser instance
+    """
+    parser = argparse.ArgumentParser(
+        prog='ecom-admin',
+        description='Multi-platform e-commerce data pipeline'
+    )
+    subparsers = parser.add_subparsers(dest='command', metavar='<command>')
+    # shopee options are parsed by Shopee.from_args after its lazy import,
+    # the subcommand forwards every remaining argument (including -h) as is
+    subparsers.add_parser('shopee', add_help=False, help='Run the Shopee management script.')
+    subparsers.add_parser('help', help='Show this help message.')
+    return parser
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Main entry point for the ecom-admin command
+    
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    # command names are case-insensitive, argparse choices are not
+    if argv and _command_handler(argv[0]) is None and _command_handler(argv[0].lower()) is not None:
+        argv = [argv[0].lower(), *argv[1:]]
+    
+    parser = create_argument_parser()
+    parsed, args = parser.parse_known_args(argv)
+    if parsed.command is None:
+        parser.print_help()
+        sys.exit(1)
+        
+    try:
+        _command_handler(parsed.command)(args)
+    except KeyboardInterrupt:
+        sys.stderr.write("\nOperation cancelled by user.\n")
+        sys.exit(130)
+
+def run() -> None:
+    """Console entry point, runs main() and skips interpreter teardown on success"""
+    # process wide hook, only installed for the command line, not for main() callers
+    sys.excepthook = _excepthook
+    main()
+    # output files are already closed, flush the streams and leave without
+    # running atexit handlers and freeing every pandas object one by one
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(0)
+
+if __name__ == "__main__":
+    run()
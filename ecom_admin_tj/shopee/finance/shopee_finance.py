@@ -3,7 +3,6 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from tqdm import tqdm
 from ...common.excel_format_mixin import ExcelFormatMixin, Worksheet
 
 class ShopeeFinanceMixin(ExcelFormatMixin):
@@ -208,6 +207,8 @@ class ShopeeFinanceMixin(ExcelFormatMixin):
             color = '\033[91m'  # Red
         reset_color = '\033[0m'
         
+        # progress bar is only drawn by finance checks, keep tqdm out of the package import
+        from tqdm import tqdm
         with tqdm(total=total_orders, desc=f"{color}Matched Orders{reset_color}", unit="order", ncols=80, 
                   bar_format='{desc}: {percentage:3.1f}%|{bar}| {n_fmt}/{total_fmt}',
                   colour='green' if match_percentage >= 80 else 'yellow' if match_percentage >= 50 else 'red') as pbar:
@@ -7,8 +7,39 @@ class Shopee(Base):
     
     SHIPPING_FEE_ITEM_ID = '00-0000-00'
     TOTAL = 'TOTAL'
-    invoice_group_dict: dict[str, pd.DataFrame] = {}
-    deduct_stock_df: pd.DataFrame | None = None
+    # Column widths per exported sheet, invoice applies to every invoice sheet
+    COLUMN_WIDTHS: dict[str, list[tuple[str, int]]] = {
+        'to_day_orders': [
+            ('A', 25),  # หมายเลขคำสั่งซื้อ
+            ('B', 15),  # เลขอ้างอิง Parent SKU
+            ('C', 50),  # ชื่อสินค้า
+            ('D', 10),  # ราคาตั้งต้น
+            ('E', 10),  # ราคาขาย
+            ('F', 10),  # จำนวน
+            ('G', 10),  # ราคาขายสุทธิ
+            ('H', 10),  # ค่าจัดส่งที่ชำระโดยผู้ซื้อ
+            ('I', 10),  # ค่าจัดส่งที่ Shopee ออกให้โดยประมาณ
+            ('J', 10),  # ผู้ซื้อร้องขอใบกำกับภาษี
+            ('K', 25),  # วันที่คาดว่าจะทำการจัดส่งสินค้า
+        ],
+        'invoice': [
+            ('A', 20),  # stock_item_id
+            ('B', 50),  # stock_item_name
+            ('C', 15),  # จำนวนรวม
+            ('D', 20),  # ราคาขายสุทธิ
+        ],
+        'Stock Deduction': [
+            ('A', 20),  # stock_item_id
+            ('B', 50),  # stock_item_name
+            ('C', 15),  # quantity
+        ],
+        'Finance Summary': [
+            ('A', 25),  # หมายเลขคำสั่งซื้อ
+            ('B', 15),  # ราคาขายสุทธิ
+            ('C', 15),  # ค่าจัดส่งที่ชำระโดยผู้ซื้อ
+            ('D', 20),  # ค่าจัดส่งที่ Shopee ออกให้โดยประมาณ
+        ],
+    }
     
     def __init__(self, input_file: str, output_file: str = None, shipping_date = None, mapping_file: str = None):
         """Initialize Shopee processor with specific settings"""
@@ -21,6 +52,9 @@ class Shopee(Base):
         self.ORIGINAL_SHEET_NAME = "orders"
         self.merge_left = 'เลขอ้างอิง Parent SKU'
         self.merge_right = 'platform_sku'
+        # per instance state, a class level dict would carry invoice groups over to the next run
+        self.invoice_group_dict: dict[str, pd.DataFrame] = {}
+        self.deduct_stock_df: pd.DataFrame | None = None
     
     def load_mapping(self) -> pd.DataFrame:
         """Load item mapping specific to Shopee"""
@@ -57,17 +91,14 @@ class Shopee(Base):
         # Try to read with cancellation reason column, if not exists, read without it
         if self.original_df is None:
             self.original_df = pd.read_excel(
-                self.input_file, sheet_name=self.ORIGINAL_SHEET_NAME)
+                self.input_file, sheet_name=self.ORIGINAL_SHEET_NAME, dtype={'ราคาขายสุทธิ': np.float64})
         
-        if 'เหตุผลในการยกเลิกคำสั่งซื้อ' in self.original_df.columns:
-            self.main_df = self.original_df[required_cols + ['เหตุผลในการยกเลิกคำสั่งซื้อ']].copy()
-            has_cancel_reason = True
-        else:
-            self.main_df = self.original_df[required_cols].copy()
-            has_cancel_reason = False
+        has_cancel_reason = 'เหตุผลในการยกเลิกคำสั่งซื้อ' in self.original_df.columns
+        if has_cancel_reason:
+            required_cols = required_cols + ['เหตุผลในการยกเลิกคำสั่งซื้อ']
 
-        self.main_df = self.main_df.dropna(subset=['หมายเลขคำสั่งซื้อ']).copy()
-        self.main_df['ราคาขายสุทธิ'] = self.main_df['ราคาขายสุทธิ'].astype(np.float64)
+        # column selection and dropna already return new frames, no extra copy needed
+        self.main_df = self.original_df[required_cols].dropna(subset=['หมายเลขคำสั่งซื้อ'])
         self.main_df['วันที่คาดว่าจะทำการจัดส่งสินค้า'] = pd.to_datetime(self.main_df['วันที่คาดว่าจะทำการจัดส่งสินค้า'], errors='coerce')
 
         # today is first row in df
@@ -104,13 +135,13 @@ class Shopee(Base):
         }).reset_index()
         
         # Add footer row with totals
-        total_row = {
+        total_row = pd.DataFrame([{
             'หมายเลขคำสั่งซื้อ': 'TOTAL',
             'ราคาขายสุทธิ': self.finance_df['ราคาขายสุทธิ'].sum(),
             'ค่าจัดส่งที่ชำระโดยผู้ซื้อ': self.finance_df['ค่าจัดส่งที่ชำระโดยผู้ซื้อ'].sum(),
             'ค่าจัดส่งที่ Shopee ออกให้โดยประมาณ': self.finance_df['ค่าจัดส่งที่ Shopee ออกให้โดยประมาณ'].sum(),
-        }
-        self.finance_df.loc[len(self.finance_df)] = total_row
+        }])
+        self.finance_df = pd.concat([self.finance_df, total_row], ignore_index=True)
         
         return self.finance_df
     
@@ -123,9 +154,9 @@ class Shopee(Base):
             buyer_shipping_fee (float): Shipping fee paid by buyer to be added to invoice
         '''
         def split_with_ratio(df) -> tuple[pd.DataFrame, pd.DataFrame]:
-            ratio_1_df = df[df['ratio'] == 1]
-            ratio_not_1_df = df[df['ratio'] != 1]
-            return ratio_1_df, ratio_not_1_df
+            # one mask over the raw ndarray serves both sides of the split
+            is_ratio_1 = df['ratio'].to_numpy() == 1.0
+            return df[is_ratio_1], df[~is_ratio_1]
         
         if merge_df is None:
             raise ValueError("merged_df is None. Please merge mapping before calculating invoice.")
@@ -178,17 +209,7 @@ class Shopee(Base):
             # Sheet 2: To day orders
             self.main_df.to_excel(writer, sheet_name='to_day_orders', index=False)
             to_day_sheet: Worksheet = writer.sheets['to_day_orders']
-            to_day_sheet.column_dimensions['A'].width = 25  # หมายเลขคำสั่งซื้อ
-            to_day_sheet.column_dimensions['B'].width = 15  # เลขอ้างอิง Parent SKU
-            to_day_sheet.column_dimensions['C'].width = 50  # ชื่อสินค้า
-            to_day_sheet.column_dimensions['D'].width = 10  # ราคาตั้งต้น
-            to_day_sheet.column_dimensions['E'].width = 10  # ราคาขาย
-            to_day_sheet.column_dimensions['F'].width = 10  # จำนวน
-            to_day_sheet.column_dimensions['G'].width = 10  # ราคาขายสุทธิ
-            to_day_sheet.column_dimensions['H'].width = 10  # ค่าจัดส่งที่ชำระโดยผู้ซื้อ
-            to_day_sheet.column_dimensions['I'].width = 10  # ค่าจัดส่งที่ Shopee ออกให้โดยประมาณ
-            to_day_sheet.column_dimensions['J'].width = 10  # ผู้ซื้อร้องขอใบกำกับภาษี  
-            to_day_sheet.column_dimensions['K'].width = 25  # วันที่คาดว่าจะทำการจัดส่งสินค้า
+            self._set_column_widths(to_day_sheet, self.COLUMN_WIDTHS['to_day_orders'])
             self._formating_header(to_day_sheet)
             
             
@@ -198,10 +219,7 @@ class Shopee(Base):
                 sheet_name = str(group_key).replace('/', '_')[:31]
                 invoice_df.to_excel(writer, sheet_name=sheet_name, index=True)
                 invoice_sheet: Worksheet = writer.sheets[sheet_name]
-                invoice_sheet.column_dimensions['A'].width = 20  # stock_item_id
-                invoice_sheet.column_dimensions['B'].width = 50  # stock_item_name
-                invoice_sheet.column_dimensions['C'].width = 15  # จำนวนรวม
-                invoice_sheet.column_dimensions['D'].width = 20  # ราคาขายสุทธิ
+                self._set_column_widths(invoice_sheet, self.COLUMN_WIDTHS['invoice'])
                 self._formating_header(sheet=invoice_sheet)
                 self._formatting_body(sheet=invoice_sheet, start_row=2, end_row=len(invoice_df), start_col=1, end_col=4)
                 self._formatting_footer(sheet=invoice_sheet, footer_row=len(invoice_df)+1)
@@ -210,9 +228,7 @@ class Shopee(Base):
             # Stock deduction summary
             self.deduct_stock_df.to_excel(writer, sheet_name='Stock Deduction', index=True)
             stock_sheet: Worksheet = writer.sheets['Stock Deduction']
-            stock_sheet.column_dimensions['A'].width = 20  # stock_item_id
-            stock_sheet.column_dimensions['B'].width = 50  # stock_item_name
-            stock_sheet.column_dimensions['C'].width = 15  # quantity
+            self._set_column_widths(stock_sheet, self.COLUMN_WIDTHS['Stock Deduction'])
             self._formating_header(stock_sheet)
             self._formatting_body(sheet=stock_sheet, start_row=2, end_row=len(self.deduct_stock_df) + 1, start_col=1, end_col=3)    
             
@@ -223,10 +239,7 @@ class Shopee(Base):
             # Finance summary
             self.finance_df.to_excel(writer, sheet_name='Finance Summary', index=False)
             finance_sheet: Worksheet = writer.sheets['Finance Summary']
-            finance_sheet.column_dimensions['A'].width = 25  # หมายเลขคำสั่งซื้อ
-            finance_sheet.column_dimensions['B'].width = 15  # ราคาขายสุทธิ
-            finance_sheet.column_dimensions['C'].width = 15  # ค่าจัดส่งที่ชำระโดยผู้ซื้อ
-            finance_sheet.column_dimensions['D'].width = 20  # ค่าจัดส่งที่ Shopee ออกให้โดยประมาณ
+            self._set_column_widths(finance_sheet, self.COLUMN_WIDTHS['Finance Summary'])
             self._formating_header(finance_sheet)
             self._formatting_body(
                 sheet=finance_sheet, 
@@ -248,12 +261,13 @@ class Shopee(Base):
         # Group by VAT requested
         df_vat: pd.DataFrame = self.merged_df[self.merged_df['ผู้ซื้อร้องขอใบกำกับภาษี'] == 'Yes']
         for order_sn in df_vat['หมายเลขคำสั่งซื้อ'].unique():
-            self.invoice_group_dict[order_sn] = df_vat[df_vat['หมายเลขคำสั่งซื้อ'] == order_sn].copy()
+            self.invoice_group_dict[order_sn] = df_vat[df_vat['หมายเลขคำสั่งซื้อ'] == order_sn]
+        # Shipping fee is repeated on every item row, keep one value per order
+        fee_per_order: pd.Series = self.merged_df.drop_duplicates('หมายเลขคำสั่งซื้อ').set_index('หมายเลขคำสั่งซื้อ')['ค่าจัดส่งที่ชำระโดยผู้ซื้อ']
         # Calculate invoices
         for group_key, group_df in self.invoice_group_dict.items():
             print(f'Processing group: {group_key}')
-            # buyer_shipping_fee: float = group_df['ค่าจัดส่งที่ชำระโดยผู้ซื้อ'].sum()
-            buyer_shipping_fee: float = group_df.groupby('หมายเลขคำสั่งซื้อ')['ค่าจัดส่งที่ชำระโดยผู้ซื้อ'].first().sum()
+            buyer_shipping_fee: float = fee_per_order.loc[group_df['หมายเลขคำสั่งซื้อ'].unique()].sum()
             order_invoice_df = self.calculate_invoice(group_df, buyer_shipping_fee)
             self.invoice_group_dict[group_key] = order_invoice_df
             
@@ -291,18 +305,21 @@ class Shopee(Base):
         print(f'Reading input file: {self.input_file}')
         print(f'Processing date: {self.shipping_date.strftime("%Y-%m-%d") if self.shipping_date else "Not specified"}')
 
-        # Load data
-        self.mapping_df = self.load_mapping()
-        self.main_df = self.load_main_df()
+        # Copy-on-write makes slices safe to use without defensive .copy(),
+        # scoped to this run so other processors in the process are unaffected
+        with pd.option_context('mode.copy_on_write', True):
+            # Load data
+            self.mapping_df = self.load_mapping()
+            self.main_df = self.load_main_df()
 
-        # Process
-        self.merged_df = self.merge_mapping()
-        self.calculate_group_invoice()
-        self.calculate_total_deduct_stock()
-        self.calculate_finance_df()
+            # Process
+            self.merged_df = self.merge_mapping()
+            self.calculate_group_invoice()
+            self.calculate_total_deduct_stock()
+            self.calculate_finance_df()
         
-        # Export
-        print(f'Exporting to Excel file: {self.output_file}')
-        self.export_excel()
+            # Export
+            print(f'Exporting to Excel file: {self.output_file}')
+            self.export_excel()
         
         print("Process completed successfully!")
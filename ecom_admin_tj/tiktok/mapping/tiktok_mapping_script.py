@@ -1,6 +1,8 @@
 import pandas as pd
+import numpy as np
 import os
-import json
+import mmap
+import ijson
 
 
 """ 
@@ -22,19 +24,22 @@ def tiktok_product_json_to_dataframe(json_path: str) -> pd.DataFrame:
     if not os.path.exists(json_path):
         raise FileNotFoundError(f"Input JSON file not found: {json_path}")
     
-    with open(json_path, 'r', encoding='utf-8') as file:
-        data: dict = json.load(file)
-    
-    products: list[dict] = []
+    item_ids: list[str] = []
+    item_names: list[str] = []
+    item_skus: list[str] = []
 
-    for p in data['data']['products']:
-        products.append({
-            'item_id': p['skus'][0]["id"],
-            'item_name': p['product_name'],
-            'item_sku': p['skus'][0]["seller_sku"]
-        })
+    # Stream products one by one from a read-only memory map of the response file
+    with open(json_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+        for p in ijson.items(mapped_file, 'data.products.item'):
+            item_ids.append(p['skus'][0]["id"])
+            item_names.append(p['product_name'])
+            item_skus.append(p['skus'][0]["seller_sku"])
 
-    return pd.DataFrame(products)
+    return pd.DataFrame({
+        'item_id': item_ids,
+        'item_name': item_names,
+        'item_sku': item_skus
+    })
 
 def create_item_mapping_excel():
     """
@@ -71,97 +76,88 @@ def create_item_mapping_excel():
     num_rows = len(platform_df) * 3  # Allow up to 3 mappings per platform item on average
     
     mapping_template = pd.DataFrame({
-        'platform_item_id': [''] * num_rows,
-        'platform_item_name': [''] * num_rows,
-        'stock_item_id': [''] * num_rows,
-        'stock_item_name': [''] * num_rows,
-        'multiplier': [1.0] * num_rows  # Default multiplier is 1.0
+        'platform_item_id': np.full(num_rows, '', dtype=object),
+        'platform_item_name': np.full(num_rows, '', dtype=object),
+        'stock_item_id': np.full(num_rows, '', dtype=object),
+        'stock_item_name': np.full(num_rows, '', dtype=object),
+        'multiplier': np.ones(num_rows)  # Default multiplier is 1.0
     })
     
     # Create Excel writer
     print(f"\nCreating Excel file: {output_file}")
-    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
         # Write Stock Items sheet
         stock_df.to_excel(writer, sheet_name='Stock Items', index=False)
         
         # Write Platform Items sheet
         platform_df.to_excel(writer, sheet_name='Platform Items', index=False)
         
-        # Write Item Mapping sheet (template)
-        mapping_template.to_excel(writer, sheet_name='Item Mapping', index=False)
+        # Write Item Mapping sheet (template), row 1 is kept for instructions
+        mapping_template.to_excel(writer, sheet_name='Item Mapping', index=False, startrow=1)
         
         # Get the workbook and sheets to format
-        # workbook = writer.book
+        workbook = writer.book
         
         # Format Stock Items sheet
         stock_sheet = writer.sheets['Stock Items']
-        stock_sheet.column_dimensions['A'].width = 15  # item_id
-        stock_sheet.column_dimensions['B'].width = 60  # item_name
+        stock_sheet.set_column('A:A', 15)  # item_id
+        stock_sheet.set_column('B:B', 60)  # item_name
         
         # Format Platform Items sheet
         platform_sheet = writer.sheets['Platform Items']
-        platform_sheet.column_dimensions['A'].width = 15  # item_id
-        platform_sheet.column_dimensions['B'].width = 80  # item_name
-        platform_sheet.column_dimensions['C'].width = 20  # item_sku
-        platform_sheet.column_dimensions['D'].width = 15  # item_status
-        platform_sheet.column_dimensions['E'].width = 12  # has_model
-        platform_sheet.column_dimensions['F'].width = 12  # model_count
-        platform_sheet.column_dimensions['G'].width = 12  # image_count
+        platform_sheet.set_column('A:A', 15)  # item_id
+        platform_sheet.set_column('B:B', 80)  # item_name
+        platform_sheet.set_column('C:C', 20)  # item_sku
+        platform_sheet.set_column('D:D', 15)  # item_status
+        platform_sheet.set_column('E:E', 12)  # has_model
+        platform_sheet.set_column('F:F', 12)  # model_count
+        platform_sheet.set_column('G:G', 12)  # image_count
         
         # Format Item Mapping sheet
         mapping_sheet = writer.sheets['Item Mapping']
-        mapping_sheet.column_dimensions['A'].width = 20  # platform_item_id
-        mapping_sheet.column_dimensions['B'].width = 80  # platform_item_name
-        mapping_sheet.column_dimensions['C'].width = 20  # stock_item_id
-        mapping_sheet.column_dimensions['D'].width = 60  # stock_item_name
-        mapping_sheet.column_dimensions['E'].width = 15  # multiplier
-        
-        # Add data validation and formulas
-        from openpyxl.worksheet.datavalidation import DataValidation
-        from openpyxl.styles import Font, PatternFill, Alignment
+        mapping_sheet.set_column('A:A', 20)  # platform_item_id
+        mapping_sheet.set_column('B:B', 80)  # platform_item_name
+        mapping_sheet.set_column('C:C', 20)  # stock_item_id
+        mapping_sheet.set_column('D:D', 60)  # stock_item_name
+        mapping_sheet.set_column('E:E', 15)  # multiplier
         
         # Add instruction row at the top with styling
-        mapping_sheet.insert_rows(1)
-        mapping_sheet['A1'] = '📝 Instructions: One platform item can have multiple rows for different stock items. Fill platform_item_id, select stock_item_id from dropdown, and set multiplier.'
-        mapping_sheet['A1'].font = Font(bold=True, color='FFFFFF')
-        mapping_sheet['A1'].fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-        mapping_sheet['A1'].alignment = Alignment(wrap_text=True)
-        mapping_sheet.merge_cells('A1:E1')
-        mapping_sheet.row_dimensions[1].height = 30
+        instruction_format = workbook.add_format({
+            'bold': True, 'font_color': '#FFFFFF', 'bg_color': '#4472C4', 'pattern': 1, 'text_wrap': True})
+        mapping_sheet.merge_range(
+            'A1:E1',
+            '📝 Instructions: One platform item can have multiple rows for different stock items. Fill platform_item_id, select stock_item_id from dropdown, and set multiplier.',
+            instruction_format)
+        mapping_sheet.set_row(0, 30)
         
         # Create dropdown for platform_item_id column (Column A)
-        platform_item_ids = platform_df['item_id'].astype(str).tolist()
-        dv_platform = DataValidation(
-            type="list",
-            formula1=f'"' + ','.join(platform_item_ids[:100]) + '"',  # Limit to first 100 items
-            allow_blank=True
-        )
-        dv_platform.error = 'Please select a valid platform item ID'
-        dv_platform.errorTitle = 'Invalid Item ID'
-        mapping_sheet.add_data_validation(dv_platform)
-        dv_platform.add(f'A3:A{num_rows + 2}')  # Apply to column A (platform_item_id), skip instruction row
-        
-        # Add VLOOKUP formula for platform_item_name (Column B)
-        # Formula will lookup platform_item_id in Platform Items sheet and return item_name
-        for row in range(3, num_rows + 3):  # Start from row 3 (after instruction and header)
-            mapping_sheet[f'B{row}'] = f'=IFERROR(VLOOKUP(A{row},\'Platform Items\'!A:B,2,FALSE),"")'
+        # List points at the Platform Items sheet, inline lists are limited to 255 characters
+        mapping_sheet.data_validation(f'A3:A{num_rows + 2}', {  # Apply to column A (platform_item_id), skip instruction row
+            'validate': 'list',
+            'source': f"='Platform Items'!$A$2:$A${len(platform_df) + 1}",
+            'ignore_blank': True,
+            'error_title': 'Invalid Item ID',
+            'error_message': 'Please select a valid platform item ID',
+        })
         
         # Create dropdown for stock_item_id column (Column C)
-        stock_item_ids = stock_df['item_id'].astype(str).tolist()
-        dv_stock = DataValidation(
-            type="list",
-            formula1=f'"' + ','.join(stock_item_ids) + '"',
-            allow_blank=True
-        )
-        dv_stock.error = 'Please select a valid stock item ID'
-        dv_stock.errorTitle = 'Invalid Item ID'
-        mapping_sheet.add_data_validation(dv_stock)
-        dv_stock.add(f'C3:C{num_rows + 2}')  # Apply to column C (stock_item_id), skip instruction row
+        mapping_sheet.data_validation(f'C3:C{num_rows + 2}', {  # Apply to column C (stock_item_id), skip instruction row
+            'validate': 'list',
+            'source': f"='Stock Items'!$A$2:$A${len(stock_df) + 1}",
+            'ignore_blank': True,
+            'error_title': 'Invalid Item ID',
+            'error_message': 'Please select a valid stock item ID',
+        })
         
-        # Add VLOOKUP formula for stock_item_name (Column D)
-        # Formula will lookup stock_item_id in Stock Items sheet and return item_name
-        for row in range(3, num_rows + 3):  # Start from row 3
-            mapping_sheet[f'D{row}'] = f'=IFERROR(VLOOKUP(C{row},\'Stock Items\'!A:B,2,FALSE),"")'
+        # Add VLOOKUP formulas for platform_item_name (Column B) and stock_item_name (Column D)
+        # Formulas lookup the item id in Platform Items / Stock Items sheet and return item_name
+        # Both columns are filled in one pass, cached value '' keeps empty rows blank until recalculated
+        rows = range(3, num_rows + 3)  # Start from row 3 (after instruction and header)
+        platform_name_formulas = [f'=IFERROR(VLOOKUP(A{row},\'Platform Items\'!A:B,2,FALSE),"")' for row in rows]
+        stock_name_formulas = [f'=IFERROR(VLOOKUP(C{row},\'Stock Items\'!A:B,2,FALSE),"")' for row in rows]
+        for row_num, platform_name_formula, stock_name_formula in zip(rows, platform_name_formulas, stock_name_formulas):
+            mapping_sheet.write_formula(row_num - 1, 1, platform_name_formula, None, '')
+            mapping_sheet.write_formula(row_num - 1, 3, stock_name_formula, None, '')
     
     print(f"\n✅ Excel file created successfully!")
     print(f"   Location: {output_file}")
@@ -1,13 +1,17 @@
 from ..common.base import Base
+from ..common.xlsxwriter_format_mixin import XlsxWriterFormatMixin
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from xlsxwriter import Workbook
 
-class Tiktok(Base):
+class Tiktok(Base, XlsxWriterFormatMixin):
     
     SCRIPT_DIR = Path(__file__).parent
     MAPPING_FILE = SCRIPT_DIR / 'tiktok_item_mapping.xlsx'
     ORIGINAL_SHEET_NAME = 'OrderSKUList'
+    # Rust based reader (python-calamine), same results as openpyxl but much faster
+    EXCEL_ENGINE = 'calamine'
     
     def __init__(self, input_file: str, output_file: str = None, shipping_date = None, mapping_file: str = None):
         """Initialize Tiktok processor with specific settings
@@ -40,7 +44,7 @@ class Tiktok(Base):
             'stock_item_name': str,
             'multiplier': np.int64,
         }
-        self.mapping_df = pd.read_excel(mapping_file_path, sheet_name='Item Mapping', skiprows=1, dtype=mapping_type_dict)
+        self.mapping_df = pd.read_excel(mapping_file_path, sheet_name='Item Mapping', skiprows=1, dtype=mapping_type_dict, engine=self.EXCEL_ENGINE)
         self.mapping_df.dropna(subset=['platform_item_id'], inplace=True)
         return self.mapping_df
     
@@ -56,11 +60,14 @@ class Tiktok(Base):
             'SKU Subtotal After Discount': np.float64,
             }
         
-        self.original_df = pd.read_excel(
-            self.input_file, 
-            sheet_name=self.ORIGINAL_SHEET_NAME, 
-            dtype=type_dict, header=0, 
-            skiprows=None if self.input_file.endswith('_output.xlsx') else [1])
+        # open the workbook once for both the order sheet and the canceled orders sheet
+        with pd.ExcelFile(self.input_file, engine=self.EXCEL_ENGINE) as input_xlsx:
+            self.original_df = pd.read_excel(
+                input_xlsx, 
+                sheet_name=self.ORIGINAL_SHEET_NAME, 
+                dtype=type_dict, header=0, 
+                skiprows=None if self.input_file.endswith('_output.xlsx') else [1])
+            self.load_canceled_orders(input_xlsx)
         
         if "Cancelation/Return Type" not in self.original_df.columns:
             # ถ้าอ่านด้วย pandas ไม่เจอคอลัมน์ "Cancelation/Return Type"
@@ -69,41 +76,27 @@ class Tiktok(Base):
 
             wb = load_workbook(self.input_file, read_only=True, data_only=True)
             ws = wb.active
+            rows = ws.iter_rows(values_only=True)
 
             # อ่าน header จากแถวที่ 1
-            headers = []
-            for col in range(1, ws.max_column + 1):
-                header = ws.cell(row=1, column=col).value
-                headers.append(header)
-
-            # print(f"Headers ({len(headers)} columns):")
-            # print(headers[:10])
+            headers = list(next(rows))
 
             # อ่านข้อมูลเริ่มจากแถวที่ 3 (ข้าม header และ description)
-            data = []
-            for row in range(3, ws.max_row + 1):
-                row_data = []
-                for col in range(1, ws.max_column + 1):
-                    cell_value = ws.cell(row=row, column=col).value
-                    row_data.append(cell_value)
-                data.append(row_data)
+            next(rows, None)
+            data = list(rows)
+            wb.close()
 
             # สร้าง DataFrame
             self.original_df = pd.DataFrame(data, columns=headers)
             self.original_df = self.original_df.astype(type_dict)
         
-        df = self.original_df.copy()
-        
-        # clean dataframe
-        df = df[df["Cancelation/Return Type"].isna()]
-        df.reset_index(inplace=True)
-        
+        # clean dataframe, filter rows and select columns in one step
         columns= ['Order ID', 'SKU ID', 'Product Name', 'Quantity', 'SKU Unit Original Price', 'SKU Subtotal Before Discount', 'SKU Seller Discount', 'SKU Subtotal After Discount']
-        df = df[columns]
+        not_canceled = self.original_df["Cancelation/Return Type"].isna()
+        df = self.original_df.loc[not_canceled, columns].reset_index(drop=True)
 
-        # read canceled sheets
-        self.load_canceled_orders()
-        canceled_order_sns = self.canceled_orders_df['canceled_orders_sn'].dropna().unique()
+        # exclude canceled orders
+        canceled_order_sns = set(self.canceled_orders_df['canceled_orders_sn'].dropna().astype(str))
         df = df[~df['Order ID'].isin(canceled_order_sns)]
         
         # count unique order numbers
@@ -113,9 +106,23 @@ class Tiktok(Base):
         return self.main_df
     
     def merge_mapping(self) -> pd.DataFrame:
-        """Merge main dataframe with mapping"""
-        super().merge_mapping()
-        self.merged_df['จำนวนรวม'] = self.merged_df['Quantity'] * self.merged_df['multiplier']
+        """Merge main dataframe with mapping
+        
+        When every platform item maps to a single stock item the mapping
+        columns are looked up with Series.map, which skips the merge join.
+        Platform items split over several stock items need the full merge.
+        """
+        if self.mapping_df[self.merge_right].is_unique:
+            mapping = self.mapping_df.set_index(self.merge_right)
+            keys = self.main_df[self.merge_left]
+            self.merged_df = self.main_df.assign(**{col: keys.map(mapping[col]) for col in mapping.columns})
+            self._check_missing_mapping()
+        else:
+            super().merge_mapping()
+        # multiplier has no NaN after the mapping check, multiply as int64 arrays
+        quantity = self.merged_df['Quantity'].to_numpy(dtype=np.int64)
+        multiplier = self.merged_df['multiplier'].to_numpy(dtype=np.int64)
+        self.merged_df['จำนวนรวม'] = np.multiply(quantity, multiplier)
         return self.merged_df
     
     def calculate_invoice(self):
@@ -123,18 +130,26 @@ class Tiktok(Base):
         if self.merged_df is None:
             raise ValueError("Merged dataframe is not available. Please run merge_mapping() first.")
         
-        self.invoice_df = self.merged_df.groupby('stock_item_id').agg({
-        'stock_item_name': 'first',
-        'จำนวนรวม': 'sum',
-        'SKU Subtotal Before Discount': 'sum',
-        'SKU Seller Discount': 'sum'
-        }).reset_index()
-        self.invoice_df.loc['TOTAL'] = [
-            'TOTAL',
-            '', 
-            '', 
-            self.invoice_df['SKU Subtotal Before Discount'].sum(), 
-            self.invoice_df['SKU Seller Discount'].sum()]
+        # group by stock_item_id: sorted codes, name from the first non-null row of each group like 'first'
+        codes, stock_item_ids = pd.factorize(self.merged_df['stock_item_id'], sort=True)
+        names = self.merged_df['stock_item_name']
+        named_rows = np.flatnonzero((codes >= 0) & names.notna().to_numpy())
+        group_codes, first_named = np.unique(codes[named_rows], return_index=True)
+        stock_item_names = np.full(len(stock_item_ids), np.nan, dtype=object)
+        stock_item_names[group_codes] = names.to_numpy()[named_rows[first_named]]
+        self.invoice_df = pd.DataFrame({
+            'stock_item_id': np.asarray(stock_item_ids, dtype=object),
+            'stock_item_name': stock_item_names,
+            **self._group_sums(codes, len(stock_item_ids), ['จำนวนรวม', 'SKU Subtotal Before Discount', 'SKU Seller Discount']),
+        })
+        total_row = pd.DataFrame([{
+            'stock_item_id': 'TOTAL',
+            'stock_item_name': '',
+            'จำนวนรวม': '',
+            'SKU Subtotal Before Discount': self.invoice_df['SKU Subtotal Before Discount'].sum(),
+            'SKU Seller Discount': self.invoice_df['SKU Seller Discount'].sum(),
+        }])
+        self.invoice_df = pd.concat([self.invoice_df, total_row], ignore_index=True)
         return self.invoice_df
     
     def calculate_finance_df(self) -> pd.DataFrame:
@@ -142,57 +157,108 @@ class Tiktok(Base):
         if self.merged_df is None:
             raise ValueError("Merged dataframe is not available. Please run merge_mapping() first.")
         
-        self.finance_df = self.merged_df.groupby('Order ID', sort=False).agg({
-            'SKU Subtotal Before Discount': 'sum',
-            'SKU Seller Discount': 'sum',
-            'SKU Subtotal After Discount': 'sum',   
-        }).reset_index()
+        # group by Order ID in order of first appearance
+        codes, order_ids = pd.factorize(self.merged_df['Order ID'])
+        self.finance_df = pd.DataFrame({
+            'Order ID': np.asarray(order_ids, dtype=object),
+            **self._group_sums(codes, len(order_ids), ['SKU Subtotal Before Discount', 'SKU Seller Discount', 'SKU Subtotal After Discount']),
+        })
         
         # Add footer row with totals
-        total_row = {
+        total_row = pd.DataFrame([{
             'Order ID': 'TOTAL',
             'SKU Subtotal Before Discount': self.finance_df['SKU Subtotal Before Discount'].sum(),
             'SKU Seller Discount': self.finance_df['SKU Seller Discount'].sum(),
             'SKU Subtotal After Discount': self.finance_df['SKU Subtotal After Discount'].sum(),
-        }
-        self.finance_df.loc[len(self.finance_df)] = total_row
+        }])
+        self.finance_df = pd.concat([self.finance_df, total_row], ignore_index=True)
         
         return self.finance_df
     
+    def _group_sums(self, codes: np.ndarray, size: int, columns: list[str]) -> dict[str, np.ndarray]:
+        """Sum merged_df columns per group with np.bincount
+        Args:
+            codes: Group code of each merged_df row from pd.factorize, -1 (missing key) rows are skipped
+            size: Number of groups
+            columns: Columns to sum, missing values count as 0 like groupby().sum()
+        Returns:
+            Dict of column name to group sums, integer columns stay integer
+        """
+        grouped = codes >= 0
+        sums = {}
+        for col in columns:
+            values = self.merged_df[col].to_numpy()
+            weights = values[grouped]
+            if values.dtype.kind == 'f':
+                weights = np.nan_to_num(weights, nan=0.0)
+            total = np.bincount(codes[grouped], weights=weights, minlength=size)
+            sums[col] = total.astype(values.dtype) if values.dtype.kind in 'iu' else total
+        return sums
+    
+    def _xlsx_cancel_orders(self, workbook: Workbook) -> None:
+        """Export canceled orders to xlsxwriter workbook with formatting, same layout as Base._cancel_orders_to_excel"""
+        canceled_sheet = workbook.add_worksheet('canceled_orders')
+        self._xlsx_column_widths(canceled_sheet, [('A', 25)])  # canceled_orders_sn
+        self._xlsx_header(
+            workbook, canceled_sheet, self.canceled_orders_df.columns, row_height=30,
+            font_color='FFFFFF', font_size=16, bg_color='FF0000',
+            horizontal='center', vertical='center', wrap_text=True)
+        self._xlsx_body(
+            workbook, canceled_sheet, start_row=2, end_row=200,
+            row_height=24, font_color='FF0000', font_size=14)
+        self._xlsx_rows(canceled_sheet, self.canceled_orders_df)
+        # rows left for the admin to fill in before re-running on the output file
+        self._xlsx_blank_rows(
+            workbook, canceled_sheet, start_row=len(self.canceled_orders_df) + 2, end_row=200,
+            row_height=24, font_color='FF0000', font_size=14)
+
     def export_excel(self):
-        """Export Tiktok invoice to Excel file"""
+        """Export Tiktok invoice to Excel file
         
-        from openpyxl.worksheet.worksheet import Worksheet
+        Rows are streamed to a constant_memory workbook, each row is flushed to
+        disk once the next one starts, so sheets are written top to bottom.
+        Sheets hold plain values, so strings are written as is without the
+        formula and url checks xlsxwriter runs on every string cell.
+        """
+        workbook_options = {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+        }
         
-        with pd.ExcelWriter(self.output_file, engine='openpyxl') as writer:
+        with Workbook(self.output_file, workbook_options) as workbook:
             # Sheet 1: Original orders 
-            self.original_df.to_excel(writer, sheet_name=self.ORIGINAL_SHEET_NAME, index=False)
-            original_sheet: Worksheet = writer.sheets[self.ORIGINAL_SHEET_NAME]
-            self._formating_header(original_sheet)
+            original_sheet = workbook.add_worksheet(self.ORIGINAL_SHEET_NAME)
+            self._xlsx_header(workbook, original_sheet, self.original_df.columns)
+            self._xlsx_rows(original_sheet, self.original_df)
             
             # Sheet 2: invoice
-            self.invoice_df.to_excel(writer, sheet_name=f'invoice_{self.order_sn_unique}_orders', index=False)
-            invoice_sheet: Worksheet = writer.sheets[f'invoice_{self.order_sn_unique}_orders']
-            invoice_sheet.column_dimensions['A'].width = 18  # stock_item_id
-            invoice_sheet.column_dimensions['B'].width = 48  # stock_item_name
-            invoice_sheet.column_dimensions['C'].width = 14  # จำนวนรวม
-            invoice_sheet.column_dimensions['D'].width = 14  # SKU Subtotal Before Discount
-            invoice_sheet.column_dimensions['E'].width = 14  # SKU Seller Discount
-            self._formating_header(sheet=invoice_sheet)
-            self._formatting_body(sheet=invoice_sheet, start_row=2, end_row=len(self.invoice_df), start_col=1, end_col=5)
-            self._formatting_footer(sheet=invoice_sheet, footer_row=len(self.invoice_df)+1)
+            invoice_sheet = workbook.add_worksheet(f'invoice_{self.order_sn_unique}_orders')
+            self._xlsx_column_widths(invoice_sheet, [
+                ('A', 18),  # stock_item_id
+                ('B', 48),  # stock_item_name
+                ('C', 14),  # จำนวนรวม
+                ('D', 14),  # SKU Subtotal Before Discount
+                ('E', 14),  # SKU Seller Discount
+            ])
+            self._xlsx_header(workbook, invoice_sheet, self.invoice_df.columns)
+            self._xlsx_body(workbook, invoice_sheet, start_row=2, end_row=len(self.invoice_df))
+            self._xlsx_rows(invoice_sheet, self.invoice_df.iloc[:-1])
+            self._xlsx_footer(workbook, invoice_sheet, footer_row=len(self.invoice_df)+1, values=self.invoice_df.iloc[-1].tolist())
             
             # Canceled orders (ensure string format)
-            self.canceled_orders_df.to_excel(writer, sheet_name='canceled_orders', index=False)
-            self._cancel_orders_to_excel(writer)
+            self._xlsx_cancel_orders(workbook)
             
             # Finance summary
-            self.finance_df.to_excel(writer, sheet_name='Finance Summary', index=False)
-            finance_sheet: Worksheet = writer.sheets['Finance Summary']
-            finance_sheet.column_dimensions['A'].width = 25  # Order ID
-            finance_sheet.column_dimensions['B'].width = 18  # SKU Subtotal Before Discount
-            finance_sheet.column_dimensions['C'].width = 18  # SKU Seller Discount
-            finance_sheet.column_dimensions['D'].width = 18  # SKU Subtotal After Discount
-            self._formating_header(finance_sheet)
-            self._formatting_body(sheet=finance_sheet, start_row=2, end_row=len(self.finance_df), start_col=1, end_col=4)
-            self._formatting_footer(sheet=finance_sheet, footer_row=len(self.finance_df)+1)
+            finance_sheet = workbook.add_worksheet('Finance Summary')
+            self._xlsx_column_widths(finance_sheet, [
+                ('A', 25),  # Order ID
+                ('B', 18),  # SKU Subtotal Before Discount
+                ('C', 18),  # SKU Seller Discount
+                ('D', 18),  # SKU Subtotal After Discount
+            ])
+            self._xlsx_header(workbook, finance_sheet, self.finance_df.columns)
+            self._xlsx_body(workbook, finance_sheet, start_row=2, end_row=len(self.finance_df))
+            self._xlsx_rows(finance_sheet, self.finance_df.iloc[:-1])
+            self._xlsx_footer(workbook, finance_sheet, footer_row=len(self.finance_df)+1, values=self.finance_df.iloc[-1].tolist())